@@ -1,18 +1,38 @@
 """Revenue analytics endpoints."""
 
+import asyncio
+import hashlib
 from datetime import UTC, datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import AsyncIterator, Optional, get_args
 
+import orjson
 from dateutil import parser as date_parser
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi_cache.decorator import cache
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.core.cache import LONG_TTL, REVENUE_NAMESPACE, SHORT_TTL, revenue_key_builder
+from app.database import AsyncSessionLocalRO, get_db_ro
 from app.database.crud import PaymentCRUD
-from app.schemas import RevenueResponse
+from app.schemas import PaymentStatus, RevenueResponse
 
 router = APIRouter()
 
+ALLOWED_STATUSES = frozenset(get_args(PaymentStatus))
+
+# Revenue endpoints return plain dicts; the model is kept for the OpenAPI schema only
+REVENUE_RESPONSES: dict = {200: {"model": RevenueResponse}}
+
+# Cache decorators for periods that are still open and for closed periods
+cache_short = cache(
+    expire=SHORT_TTL, namespace=REVENUE_NAMESPACE, key_builder=revenue_key_builder
+)
+cache_long = cache(
+    expire=LONG_TTL, namespace=REVENUE_NAMESPACE, key_builder=revenue_key_builder
+)
+
 
 def ensure_timezone_naive(dt: datetime) -> datetime:
     """Convert datetime to timezone-naive UTC for database queries.
@@ -26,15 +46,103 @@ def ensure_timezone_naive(dt: datetime) -> datetime:
     return dt
 
 
-@router.get("/total", response_model=RevenueResponse, operation_id="total_revenue")
+def _utc_now_naive() -> datetime:
+    """Return the current UTC time as a naive datetime for database queries.
+
+    The clock is already UTC, so this skips the general conversion done by
+    ``ensure_timezone_naive``.
+    """
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _revenue_response(  # pylint: disable=too-many-arguments
+    *,
+    total_revenue: float,
+    transaction_count: int,
+    period: str,
+    status_filter: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+) -> dict:
+    """Build a ``RevenueResponse``-shaped dict without running model validation."""
+    return {
+        "total_revenue": total_revenue,
+        "transaction_count": transaction_count,
+        "period": period,
+        "start_date": start_date,
+        "end_date": end_date,
+        "status_filter": status_filter,
+        "currency": "USD",
+    }
+
+
+async def revenue_etag(
+    request: Request,
+    response: Response,
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
+) -> None:
+    """Answer conditional requests with 304 when no newer payment exists.
+
+    Only for routes whose body isn't cached at any level. On cached routes
+    fastapi-cache's own ``ETag`` replaces this one. If only an inner helper is
+    cached, a fresh ETag would be paired with a stale body.
+
+    The weak ETag is derived from the latest ``payment_date`` for the status,
+    the request URL and the current UTC date, so now-anchored periods still
+    change when the day rolls over. Only an indexed ``MAX`` query runs on a
+    match.
+    """
+    max_date = await PaymentCRUD.max_payment_date(db, status=status)
+    fingerprint = f"{max_date}|{status}|{request.url}|{_utc_now_naive().date()}"
+    digest = hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+    etag = f'W/"{digest}"'
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso_naive(value: str) -> datetime:
+    """Parse an ISO 8601 string into a timezone-naive UTC datetime.
+
+    Memoized since clients tend to repeat the same ranges. Raises
+    ``ValueError`` for anything that isn't ISO 8601.
+    """
+    return ensure_timezone_naive(datetime.fromisoformat(value))
+
+
+def _parse_naive(value: str) -> datetime:
+    """Parse a date string into a timezone-naive UTC datetime.
+
+    ISO 8601 strings take the cached ``datetime.fromisoformat`` path. Anything
+    else falls back to dateutil, uncached because it fills missing fields from
+    today's date.
+    """
+    try:
+        return _parse_iso_naive(value)
+    except ValueError:
+        return ensure_timezone_naive(date_parser.parse(value))
+
+
+@router.get(
+    "/total",
+    response_model=None,
+    responses=REVENUE_RESPONSES,
+    operation_id="total_revenue",
+)
+@cache_short
 async def get_total_revenue(
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get total revenue for all time."""
     total, count = await PaymentCRUD.calculate_revenue(db, status=status)
 
-    return RevenueResponse(
+    return _revenue_response(
         total_revenue=total,
         transaction_count=count,
         period="all_time",
@@ -42,20 +150,26 @@ async def get_total_revenue(
     )
 
 
-@router.get("/this-month", response_model=RevenueResponse, operation_id="this_month")
+@router.get(
+    "/this-month",
+    response_model=None,
+    responses=REVENUE_RESPONSES,
+    operation_id="this_month",
+)
+@cache_short
 async def get_revenue_this_month(
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get revenue for the current month."""
-    now = ensure_timezone_naive(datetime.now(UTC))
+    now = _utc_now_naive()
     start_of_month = datetime(now.year, now.month, 1)
 
     total, count = await PaymentCRUD.calculate_revenue(
         db, start_date=start_of_month, end_date=now, status=status
     )
 
-    return RevenueResponse(
+    return _revenue_response(
         total_revenue=total,
         transaction_count=count,
         period=f"this_month_{now.year}_{now.month}",
@@ -66,21 +180,25 @@ async def get_revenue_this_month(
 
 
 @router.get(
-    "/year-to-date", response_model=RevenueResponse, operation_id="year_to_date"
+    "/year-to-date",
+    response_model=None,
+    responses=REVENUE_RESPONSES,
+    operation_id="year_to_date",
 )
+@cache_short
 async def get_revenue_year_to_date(
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get revenue from January 1st to now."""
-    now = ensure_timezone_naive(datetime.now(UTC))
+    now = _utc_now_naive()
     start_of_year = datetime(now.year, 1, 1)
 
     total, count = await PaymentCRUD.calculate_revenue(
         db, start_date=start_of_year, end_date=now, status=status
     )
 
-    return RevenueResponse(
+    return _revenue_response(
         total_revenue=total,
         transaction_count=count,
         period=f"year_to_date_{now.year}",
@@ -91,18 +209,99 @@ async def get_revenue_year_to_date(
 
 
 @router.get(
-    "/custom-range", response_model=RevenueResponse, operation_id="custom_range"
+    "/summary",
+    response_model=dict,
+    operation_id="revenue_summary",
+)
+@cache_short
+async def get_revenue_summary(
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
+):
+    """Get all-time, year-to-date and this-month revenue in a single call."""
+    now = _utc_now_naive()
+    start_of_year = datetime(now.year, 1, 1)
+    start_of_month = datetime(now.year, now.month, 1)
+
+    summary = await PaymentCRUD.revenue_summary(
+        db,
+        start_of_year=start_of_year,
+        start_of_month=start_of_month,
+        end_date=now,
+        status=status,
+    )
+
+    return {
+        **summary,
+        "year_start_date": start_of_year.isoformat(),
+        "month_start_date": start_of_month.isoformat(),
+        "end_date": now.isoformat(),
+        "status_filter": status,
+        "currency": "USD",
+    }
+
+
+async def _calculate_revenue_own_session(status: str) -> tuple[float, int]:
+    """Calculate all-time revenue on a dedicated session.
+
+    AsyncSession is not safe for concurrent use, so each concurrent query
+    checks out its own session (and pooled connection).
+    """
+    async with AsyncSessionLocalRO() as session:
+        return await PaymentCRUD.calculate_revenue(session, status=status)
+
+
+@router.get("/multi-status", response_model=dict, operation_id="multi_status")
+async def get_revenue_multi_status(statuses: str = "completed,pending,refunded"):
+    """Get total revenue for several payment statuses at once.
+
+    Pass a comma-separated list of statuses; one query per status runs
+    concurrently.
+    """
+    status_list = list(
+        dict.fromkeys(s.strip() for s in statuses.split(",") if s.strip())
+    )
+    if not status_list:
+        raise HTTPException(status_code=400, detail="statuses must not be empty")
+    unknown = [status for status in status_list if status not in ALLOWED_STATUSES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown status: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(sorted(ALLOWED_STATUSES))}",
+        )
+
+    results = await asyncio.gather(
+        *(_calculate_revenue_own_session(status) for status in status_list)
+    )
+
+    return {
+        "statuses": {
+            status: {"total_revenue": total, "transaction_count": count}
+            for status, (total, count) in zip(status_list, results)
+        },
+        "period": "all_time",
+        "currency": "USD",
+    }
+
+
+@router.get(
+    "/custom-range",
+    response_model=None,
+    responses=REVENUE_RESPONSES,
+    operation_id="custom_range",
+    dependencies=[Depends(revenue_etag)],
 )
 async def get_revenue_custom_range(
     start_date: str,
     end_date: str,
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get revenue for a custom date/time range."""
     try:
-        start_dt = ensure_timezone_naive(date_parser.parse(start_date))
-        end_dt = ensure_timezone_naive(date_parser.parse(end_date))
+        start_dt = _parse_naive(start_date)
+        end_dt = _parse_naive(end_date)
     except Exception as e:
         raise HTTPException(
             status_code=400,
@@ -118,7 +317,7 @@ async def get_revenue_custom_range(
         db, start_date=start_dt, end_date=end_dt, status=status
     )
 
-    return RevenueResponse(
+    return _revenue_response(
         total_revenue=total,
         transaction_count=count,
         period="custom_range",
@@ -128,24 +327,76 @@ async def get_revenue_custom_range(
     )
 
 
-@router.get("/last-n-days", response_model=RevenueResponse, operation_id="last_n_days")
+@router.get(
+    "/range-breakdown",
+    response_model=dict,
+    operation_id="range_breakdown",
+    dependencies=[Depends(revenue_etag)],
+)
+async def get_revenue_range_breakdown(
+    start_date: str,
+    end_date: str,
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
+):
+    """Get revenue for a custom date/time range along with its category breakdown.
+
+    Totals and per-category figures come from a single grouped query.
+    """
+    try:
+        start_dt = _parse_naive(start_date)
+        end_dt = _parse_naive(end_date)
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date format. Use ISO format: {str(e)}",
+        ) from e
+
+    if start_dt > end_dt:
+        raise HTTPException(
+            status_code=400, detail="start_date must be before end_date"
+        )
+
+    categories, total, count = await PaymentCRUD.revenue_by_category(
+        db, start_date=start_dt, end_date=end_dt, status=status
+    )
+
+    return {
+        **_revenue_response(
+            total_revenue=total,
+            transaction_count=count,
+            period="custom_range",
+            start_date=start_dt.isoformat(),
+            end_date=end_dt.isoformat(),
+            status_filter=status,
+        ),
+        "categories": categories,
+    }
+
+
+@router.get(
+    "/last-n-days",
+    response_model=None,
+    responses=REVENUE_RESPONSES,
+    operation_id="last_n_days",
+)
 async def get_revenue_last_n_days(
     days: int = 30,
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get revenue for the last N days."""
     if days < 1:
         raise HTTPException(status_code=400, detail="days must be at least 1")
 
-    now = ensure_timezone_naive(datetime.now(UTC))
+    now = _utc_now_naive()
     start_date = now - timedelta(days=days)
 
     total, count = await PaymentCRUD.calculate_revenue(
         db, start_date=start_date, end_date=now, status=status
     )
 
-    return RevenueResponse(
+    return _revenue_response(
         total_revenue=total,
         transaction_count=count,
         period=f"last_{days}_days",
@@ -155,12 +406,17 @@ async def get_revenue_last_n_days(
     )
 
 
-@router.get("/by-category", response_model=dict, operation_id="by_category")
+@router.get(
+    "/by-category",
+    response_model=dict,
+    operation_id="by_category",
+)
+@cache_short
 async def get_revenue_by_category(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
 ):
     """Get revenue breakdown by product category."""
     start_dt = None
@@ -168,7 +424,7 @@ async def get_revenue_by_category(
 
     if start_date:
         try:
-            start_dt = ensure_timezone_naive(date_parser.parse(start_date))
+            start_dt = _parse_naive(start_date)
         except Exception as e:
             raise HTTPException(
                 status_code=400, detail=f"Invalid start_date format: {str(e)}"
@@ -176,19 +432,16 @@ async def get_revenue_by_category(
 
     if end_date:
         try:
-            end_dt = ensure_timezone_naive(date_parser.parse(end_date))
+            end_dt = _parse_naive(end_date)
         except Exception as e:
             raise HTTPException(
                 status_code=400, detail=f"Invalid end_date format: {str(e)}"
             ) from e
 
-    categories = await PaymentCRUD.revenue_by_category(
+    categories, total_revenue, total_count = await PaymentCRUD.revenue_by_category(
         db, start_date=start_dt, end_date=end_dt, status=status
     )
 
-    total_revenue = sum(cat["revenue"] for cat in categories.values())
-    total_count = sum(cat["transaction_count"] for cat in categories.values())
-
     return {
         "categories": categories,
         "total_revenue": total_revenue,
@@ -199,17 +452,61 @@ async def get_revenue_by_category(
     }
 
 
-@router.get("/by-month", response_model=dict, operation_id="by_month")
-async def get_revenue_by_month(
-    year: int,
-    status: str = "completed",
-    db: AsyncSession = Depends(get_db),
+async def _stream_category_rows(
+    start_date: Optional[datetime], end_date: Optional[datetime], status: str
+) -> AsyncIterator[bytes]:
+    """Encode streamed category rows as a JSON array, one row per chunk.
+
+    The session is opened here rather than injected, because the response body
+    is produced after request-scoped dependencies have been cleaned up.
+    """
+    async with AsyncSessionLocalRO() as session:
+        separator = b"["
+        async for row in PaymentCRUD.stream_revenue_by_category(
+            session, start_date=start_date, end_date=end_date, status=status
+        ):
+            yield separator + orjson.dumps(row)
+            separator = b","
+        yield b"[]" if separator == b"[" else b"]"
+
+
+@router.get("/by-category/stream", operation_id="by_category_stream")
+async def get_revenue_by_category_stream(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    status: PaymentStatus = "completed",
 ):
-    """Get monthly revenue breakdown for a specific year."""
-    months = await PaymentCRUD.revenue_by_month(db, year=year, status=status)
+    """Stream the revenue breakdown by product category as a JSON array.
 
-    total_revenue = sum(m["revenue"] for m in months.values())
-    total_count = sum(m["transaction_count"] for m in months.values())
+    Intended for large category sets, where it keeps app-side memory flat;
+    prefer ``/by-category`` for small ones. The response isn't faster to start,
+    since the query aggregates everything before returning its first row.
+    """
+    try:
+        start_dt = _parse_naive(start_date) if start_date else None
+        end_dt = _parse_naive(end_date) if end_date else None
+    except Exception as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid date format. Use ISO format: {str(e)}",
+        ) from e
+
+    if start_dt and end_dt and start_dt > end_dt:
+        raise HTTPException(
+            status_code=400, detail="start_date must be before end_date"
+        )
+
+    return StreamingResponse(
+        _stream_category_rows(start_dt, end_dt, status),
+        media_type="application/json",
+    )
+
+
+async def _revenue_by_month(year: int, status: str, db: AsyncSession) -> dict:
+    """Build the monthly revenue breakdown for a specific year."""
+    months, total_revenue, total_count = await PaymentCRUD.revenue_by_month(
+        db, year=year, status=status
+    )
 
     return {
         "year": year,
@@ -218,3 +515,24 @@ async def get_revenue_by_month(
         "total_transactions": total_count,
         "status_filter": status,
     }
+
+
+# Past years never change, so they can be kept much longer than the current one
+_revenue_by_month_closed = cache_long(_revenue_by_month)
+_revenue_by_month_open = cache_short(_revenue_by_month)
+
+
+@router.get(
+    "/by-month",
+    response_model=dict,
+    operation_id="by_month",
+)
+async def get_revenue_by_month(
+    year: int,
+    status: PaymentStatus = "completed",
+    db: AsyncSession = Depends(get_db_ro),
+):
+    """Get monthly revenue breakdown for a specific year."""
+    if year < datetime.now(UTC).year:
+        return await _revenue_by_month_closed(year=year, status=status, db=db)
+    return await _revenue_by_month_open(year=year, status=status, db=db)
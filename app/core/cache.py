@@ -0,0 +1,82 @@
+"""Response caching for revenue endpoints using fastapi-cache."""
+
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import Coder
+from redis import asyncio as aioredis
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.database.crud import PaymentCRUD
+
+CACHE_PREFIX = "rev"
+REVENUE_NAMESPACE = "revenue"
+
+# TTLs (seconds) for "now"-anchored periods and for periods that are closed
+SHORT_TTL = 60
+LONG_TTL = 3600
+
+
+class ORJsonCoder(Coder):
+    """Cache coder using orjson, the same encoder as the JSON responses."""
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        return orjson.dumps(
+            value, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS
+        )
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(value)
+
+
+def init_cache() -> None:
+    """Initialize the response cache backend.
+
+    Uses Redis when a URL is configured, otherwise falls back to a
+    process-local in-memory backend.
+    """
+    if settings.redis_url:
+        redis = aioredis.from_url(settings.redis_url)
+        backend = RedisBackend(redis)
+    else:
+        backend = InMemoryBackend()
+    FastAPICache.init(backend, prefix=CACHE_PREFIX, coder=ORJsonCoder)
+
+
+def revenue_key_builder(  # pylint: disable=too-many-arguments
+    func: Callable[..., Any],
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,  # pylint: disable=unused-argument
+    response: Optional[Response] = None,  # pylint: disable=unused-argument
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+) -> str:
+    """Build a cache key from the endpoint name and its query parameters.
+
+    The database session is excluded so that identical queries share a key.
+    """
+    params = sorted(
+        (name, value)
+        for name, value in kwargs.items()
+        if not isinstance(value, AsyncSession)
+    )
+    return f"{namespace}:{func.__name__}:{args}:{params}"
+
+
+async def invalidate_revenue_cache() -> None:
+    """Drop all cached revenue responses.
+
+    Call this after writing payments so readers don't see stale totals.
+    """
+    await FastAPICache.clear(namespace=REVENUE_NAMESPACE)
+    PaymentCRUD.clear_closed_period_cache()
@@ -1,5 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
+from typing import Optional
+
 from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,10 +16,20 @@ class Settings(BaseSettings):
     database_host: str
     database_port: int
 
+    # Read Replica Configuration (falls back to the primary when unset)
+    database_replica_host: Optional[str] = None
+    database_replica_port: Optional[int] = None
+
     # Database Pool Configuration
     database_pool_size: int = 10
     database_max_overflow: int = 20
 
+    # Prepared statement / compiled SQL cache sizes
+    database_statement_cache_size: int = 500
+
+    # Cache Configuration
+    redis_url: Optional[str] = None
+
     # Server Configuration
     debug: bool = True
 
@@ -37,6 +49,18 @@ class Settings(BaseSettings):
             f"@{self.database_host}:{self.database_port}/{self.database_name}"
         )
 
+    @computed_field  # type: ignore[misc]
+    @property
+    def database_url_ro(self) -> str:
+        """Construct read replica database URL, or the primary URL if none is set."""
+        if not self.database_replica_host:
+            return self.database_url
+        return (
+            f"postgresql+asyncpg://{self.database_user}:{self.database_password}"
+            f"@{self.database_replica_host}"
+            f":{self.database_replica_port or self.database_port}/{self.database_name}"
+        )
+
 
 # Create a singleton instance
 settings = Settings()
@@ -1,5 +1,26 @@
 """Database Config."""
 
-from app.database.session import AsyncSessionLocal, Base, engine, get_db, init_db
+from app.database.rollup import init_rollup, refresh_rollup_periodically
+from app.database.session import (
+    AsyncSessionLocal,
+    AsyncSessionLocalRO,
+    Base,
+    engine,
+    engine_ro,
+    get_db,
+    get_db_ro,
+    init_db,
+)
 
-__all__ = ["engine", "AsyncSessionLocal", "Base", "get_db", "init_db"]
+__all__ = [
+    "engine",
+    "engine_ro",
+    "AsyncSessionLocal",
+    "AsyncSessionLocalRO",
+    "Base",
+    "get_db",
+    "get_db_ro",
+    "init_db",
+    "init_rollup",
+    "refresh_rollup_periodically",
+]
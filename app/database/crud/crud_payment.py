@@ -1,12 +1,213 @@
 """Payment CRUD operations."""
 
-from datetime import datetime
-from typing import List, Optional
+from collections import OrderedDict
+from datetime import UTC, datetime, timedelta
+from typing import Any, AsyncIterator, List, Optional, Sequence
 
-from sqlalchemy import and_, extract, func, select
+from sqlalchemy import (
+    Float,
+    Integer,
+    RowMapping,
+    Select,
+    Subquery,
+    and_,
+    bindparam,
+    extract,
+    func,
+    literal_column,
+    or_,
+    select,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.models import Payment
+from app.database.models import Payment, payment_daily_rollup
+from app.database.rollup import rollup_cutoff
+
+
+def _start_of_day(dt: datetime) -> datetime:
+    """Truncate a datetime to midnight."""
+    return datetime(dt.year, dt.month, dt.day)
+
+
+def _daily_revenue(
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    status: str,
+) -> Subquery:
+    """Per-day, per-category revenue for a range as ``(day, product_category, total, count)``.
+
+    Whole days before the rollup cutoff are read from the ``payment_daily_rollup``
+    materialized view; partial edge days and anything newer are aggregated live
+    from ``payments``.
+    """
+    day = func.date_trunc(literal_column("'day'"), Payment.payment_date)
+    live = select(
+        day.label("day"),
+        Payment.product_category,
+        func.sum(Payment.amount).label("total"),
+        func.count(Payment.id).label("count"),  # pylint: disable=not-callable
+    ).where(Payment.status == status)
+
+    if start_date:
+        live = live.where(Payment.payment_date >= start_date)
+    if end_date:
+        live = live.where(Payment.payment_date <= end_date)
+
+    # Whole days in [rollup_start, rollup_end) can be served by the view
+    rollup_end = rollup_cutoff()
+    if rollup_end and end_date:
+        rollup_end = min(
+            rollup_end, _start_of_day(end_date + timedelta(microseconds=1))
+        )
+    rollup_start = None
+    if start_date:
+        rollup_start = _start_of_day(start_date)
+        if rollup_start < start_date:
+            rollup_start += timedelta(days=1)
+
+    if rollup_end is None or (rollup_start and rollup_start >= rollup_end):
+        return live.group_by(day, Payment.product_category).subquery()
+
+    view = payment_daily_rollup.c
+    rollup = select(view.day, view.product_category, view.total, view.count).where(
+        view.status == status, view.day < rollup_end
+    )
+    if rollup_start:
+        rollup = rollup.where(view.day >= rollup_start)
+        live = live.where(
+            or_(
+                Payment.payment_date < rollup_start,
+                Payment.payment_date >= rollup_end,
+            )
+        )
+    else:
+        live = live.where(Payment.payment_date >= rollup_end)
+
+    return union_all(rollup, live.group_by(day, Payment.product_category)).subquery()
+
+
+def _grand_total(rows: Sequence[RowMapping]) -> tuple[float, int]:
+    """Return ``(revenue, count)`` from the ``ROLLUP`` grand-total row."""
+    for row in rows:
+        if row["is_total"]:
+            return row["total"] or 0.0, row["count"] or 0
+    return 0.0, 0
+
+
+def _build_total_revenue_statements() -> dict[tuple[bool, bool], Select]:
+    """Build the total revenue query for each (has_start, has_end) combination."""
+    base = select(
+        func.sum(Payment.amount).cast(Float).label("total"),
+        func.count(Payment.id).label("count"),  # pylint: disable=not-callable
+    ).where(Payment.status == bindparam("status"))
+    after_start = Payment.payment_date >= bindparam("start_date")
+    before_end = Payment.payment_date <= bindparam("end_date")
+
+    return {
+        (False, False): base,
+        (True, False): base.where(after_start),
+        (False, True): base.where(before_end),
+        (True, True): base.where(after_start, before_end),
+    }
+
+
+# Built once at import; only the bound parameters change per request
+_TOTAL_REVENUE_STATEMENTS = _build_total_revenue_statements()
+
+
+async def _total_revenue(
+    db: AsyncSession,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    status: str,
+) -> tuple[float, int]:
+    """Query total revenue and transaction count."""
+    query = _TOTAL_REVENUE_STATEMENTS[(bool(start_date), bool(end_date))]
+    params = {"status": status}
+    if start_date:
+        params["start_date"] = start_date
+    if end_date:
+        params["end_date"] = end_date
+
+    # Aggregates without GROUP BY always return exactly one row
+    row = (await db.execute(query, params)).first()
+
+    return (row.total or 0.0, row.count)
+
+
+async def _monthly_revenue(
+    db: AsyncSession, year: int, status: str
+) -> tuple[dict, float, int]:
+    """Query monthly revenue for a year along with the yearly total."""
+    daily = _daily_revenue(
+        datetime(year, 1, 1),
+        datetime(year + 1, 1, 1) - timedelta(microseconds=1),
+        status,
+    )
+    month = extract("month", daily.c.day)
+    result = await db.execute(
+        select(
+            month.label("month"),
+            func.sum(daily.c.total).cast(Float).label("total"),
+            func.sum(daily.c.count).cast(Integer).label("count"),
+            func.grouping(month).label("is_total"),
+        )
+        .group_by(func.rollup(month))  # pylint: disable=not-callable
+        .order_by(month)
+    )
+
+    rows = result.mappings().all()
+
+    months = {
+        int(row["month"]): {
+            "month": int(row["month"]),
+            "revenue": row["total"] or 0.0,
+            "transaction_count": row["count"] or 0,
+        }
+        for row in rows
+        if not row["is_total"]
+    }
+
+    return (months, *_grand_total(rows))
+
+
+def _is_closed_period(end_date: datetime) -> bool:
+    """Whether a period ended before yesterday, so its aggregates no longer change."""
+    yesterday = _start_of_day(datetime.now(UTC)) - timedelta(days=1)
+    return end_date < yesterday
+
+
+class _LRUCache:
+    """Small in-process LRU mapping with a bounded number of entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: OrderedDict[tuple, Any] = OrderedDict()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        """Return the cached value for ``key``, or None on a miss."""
+        if key not in self._data:
+            return None
+        self._data.move_to_end(key)
+        return self._data[key]
+
+    def put(self, key: tuple, value: Any) -> None:
+        """Store ``value``, evicting the least recently used entry when full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._data.clear()
+
+
+# Closed-period results are cached in-process. Misses run on the caller's
+# session, which is kept out of the key.
+_closed_total_cache = _LRUCache(maxsize=512)
+_closed_monthly_cache = _LRUCache(maxsize=512)
 
 
 class PaymentCRUD:
@@ -39,6 +240,16 @@ class PaymentCRUD:
         result = await db.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def max_payment_date(
+        db: AsyncSession, status: str = "completed"
+    ) -> Optional[datetime]:
+        """Get the most recent payment date for a status."""
+        result = await db.execute(
+            select(func.max(Payment.payment_date)).where(Payment.status == status)
+        )
+        return result.scalar_one_or_none()
+
     @staticmethod
     async def calculate_revenue(
         db: AsyncSession,
@@ -46,21 +257,67 @@ class PaymentCRUD:
         end_date: Optional[datetime] = None,
         status: str = "completed",
     ) -> tuple[float, int]:
-        """Calculate total revenue and transaction count."""
+        """Calculate total revenue and transaction count.
+
+        Closed periods are served from an in-process LRU cache.
+        """
+        if not (end_date and _is_closed_period(end_date)):
+            return await _total_revenue(db, start_date, end_date, status)
+
+        key = (start_date, end_date, status)
+        cached = _closed_total_cache.get(key)
+        if cached is None:
+            cached = await _total_revenue(db, start_date, end_date, status)
+            _closed_total_cache.put(key, cached)
+        return cached
+
+    @staticmethod
+    async def revenue_summary(
+        db: AsyncSession,
+        start_of_year: datetime,
+        start_of_month: datetime,
+        end_date: datetime,
+        status: str = "completed",
+    ) -> dict:
+        """Get all-time, year-to-date and this-month revenue in one query.
+
+        Uses aggregate ``FILTER`` clauses so the table is scanned once instead
+        of once per period.
+        """
+        in_year = and_(
+            Payment.payment_date >= start_of_year, Payment.payment_date <= end_date
+        )
+        in_month = and_(
+            Payment.payment_date >= start_of_month, Payment.payment_date <= end_date
+        )
+        # pylint: disable=not-callable
         query = select(
-            func.sum(Payment.amount).label("total"),
-            func.count(Payment.id).label("count"),  # pylint: disable=not-callable
+            func.sum(Payment.amount).cast(Float).label("total"),
+            func.count(Payment.id).label("count"),
+            func.sum(Payment.amount).filter(in_year).cast(Float).label("year_total"),
+            func.count(Payment.id).filter(in_year).label("year_count"),
+            func.sum(Payment.amount).filter(in_month).cast(Float).label("month_total"),
+            func.count(Payment.id).filter(in_month).label("month_count"),
         ).where(Payment.status == status)
+        # pylint: enable=not-callable
 
-        if start_date:
-            query = query.where(Payment.payment_date >= start_date)
-        if end_date:
-            query = query.where(Payment.payment_date <= end_date)
+        # Aggregates without GROUP BY always return exactly one row
+        row = (await db.execute(query)).first()
 
-        result = await db.execute(query)
-        row = result.one()
-
-        return (float(row.total) if row.total else 0.0, row.count)
+        return {
+            "total": {
+                "revenue": row.total or 0.0,
+                "transaction_count": row.count,
+            },
+            "year_to_date": {
+                "revenue": row.year_total or 0.0,
+                "transaction_count": row.year_count,
+            },
+            "this_month": {
+                "revenue": row.month_total or 0.0,
+                "transaction_count": row.month_count,
+            },
+        }
 
     @staticmethod
     async def revenue_by_category(
@@ -68,64 +325,90 @@ class PaymentCRUD:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         status: str = "completed",
-    ) -> dict:
-        """Get revenue breakdown by category."""
-        query = select(
-            Payment.product_category,
-            func.sum(Payment.amount).label("total"),
-            func.count(Payment.id).label("count"),  # pylint: disable=not-callable
-        ).where(Payment.status == status)
+    ) -> tuple[dict, float, int]:
+        """Get revenue breakdown by category along with the grand total.
 
-        if start_date:
-            query = query.where(Payment.payment_date >= start_date)
-        if end_date:
-            query = query.where(Payment.payment_date <= end_date)
-
-        query = query.group_by(Payment.product_category)
+        The grand total is computed by the database in the same scan using
+        ``ROLLUP``; ``GROUPING()`` distinguishes it from the NULL category.
+        """
+        daily = _daily_revenue(start_date, end_date, status)
+        query = select(
+            daily.c.product_category,
+            func.sum(daily.c.total).cast(Float).label("total"),
+            func.sum(daily.c.count).cast(Integer).label("count"),
+            func.grouping(daily.c.product_category).label("is_total"),
+        ).group_by(
+            func.rollup(daily.c.product_category)  # pylint: disable=not-callable
+        )
 
-        result = await db.execute(query)
-        rows = result.all()
+        rows = (await db.execute(query)).mappings().all()
 
-        categories = {}
-        for row in rows:
-            category = row.product_category or "uncategorized"
-            categories[category] = {
-                "revenue": float(row.total) if row.total else 0.0,
-                "transaction_count": row.count,
+        categories = {
+            (row["product_category"] or "uncategorized"): {
+                "revenue": row["total"] or 0.0,
+                "transaction_count": row["count"] or 0,
             }
+            for row in rows
+            if not row["is_total"]
+        }
 
-        return categories
+        return (categories, *_grand_total(rows))
 
     @staticmethod
-    async def revenue_by_month(
-        db: AsyncSession, year: int, status: str = "completed"
-    ) -> dict:
-        """Get monthly revenue for a specific year."""
-        result = await db.execute(
+    async def stream_revenue_by_category(
+        db: AsyncSession,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status: str = "completed",
+    ) -> AsyncIterator[dict]:
+        """Yield per-category revenue rows from a server-side cursor.
+
+        The database still finishes the aggregation before the first row
+        arrives. The cursor only keeps the full result set out of app memory.
+        """
+        daily = _daily_revenue(start_date, end_date, status)
+        query = (
             select(
-                extract("month", Payment.payment_date).label("month"),
-                func.sum(Payment.amount).label("total"),
-                func.count(Payment.id).label("count"),  # pylint: disable=not-callable
-            )
-            .where(
-                and_(
-                    Payment.status == status,
-                    extract("year", Payment.payment_date) == year,
-                )
+                daily.c.product_category,
+                func.sum(daily.c.total).cast(Float).label("total"),
+                func.sum(daily.c.count).cast(Integer).label("count"),
             )
-            .group_by(extract("month", Payment.payment_date))
-            .order_by(extract("month", Payment.payment_date))
+            .group_by(daily.c.product_category)
+            .order_by(daily.c.product_category)
         )
 
-        rows = result.all()
+        result = await db.stream(query)
+        try:
+            async for row in result.mappings():
+                yield {
+                    "category": row["product_category"] or "uncategorized",
+                    "revenue": row["total"] or 0.0,
+                    "transaction_count": row["count"] or 0,
+                }
+        finally:
+            await result.close()
 
-        months = {}
-        for row in rows:
-            month_num = int(row.month)
-            months[month_num] = {
-                "month": month_num,
-                "revenue": float(row.total) if row.total else 0.0,
-                "transaction_count": row.count,
-            }
+    @staticmethod
+    async def revenue_by_month(
+        db: AsyncSession, year: int, status: str = "completed"
+    ) -> tuple[dict, float, int]:
+        """Get monthly revenue for a specific year along with the yearly total.
+
+        The yearly total is computed by the database in the same scan using
+        ``ROLLUP``. Closed years are served from an in-process LRU cache.
+        """
+        if not _is_closed_period(datetime(year + 1, 1, 1) - timedelta(microseconds=1)):
+            return await _monthly_revenue(db, year, status)
 
-        return months
+        key = (year, status)
+        cached = _closed_monthly_cache.get(key)
+        if cached is None:
+            cached = await _monthly_revenue(db, year, status)
+            _closed_monthly_cache.put(key, cached)
+        return cached
+
+    @staticmethod
+    def clear_closed_period_cache() -> None:
+        """Drop cached closed-period results, e.g. after backdated writes."""
+        _closed_total_cache.clear()
+        _closed_monthly_cache.clear()
@@ -1,5 +1,6 @@
 """SQLAlchemy database models."""
 
 from app.database.models.payment import Payment
+from app.database.models.payment_rollup import payment_daily_rollup
 
-__all__ = ["Payment"]
+__all__ = ["Payment", "payment_daily_rollup"]
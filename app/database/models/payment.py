@@ -42,7 +42,7 @@ class Payment(Base):
 
     # Timestamps
     payment_date: Mapped[datetime] = mapped_column(
-        DateTime, index=True, default=lambda: datetime.now(UTC)
+        DateTime, default=lambda: datetime.now(UTC)
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=lambda: datetime.now(UTC)
@@ -58,4 +58,11 @@ class Payment(Base):
         Index("idx_payment_date_status", "payment_date", "status"),
         Index("idx_payment_date_category", "payment_date", "product_category"),
         Index("idx_customer_payment_date", "customer_id", "payment_date"),
+        # BRIN index for wide time-range scans on the append-mostly payments table
+        Index(
+            "idx_payment_date_brin",
+            "payment_date",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
     )
@@ -0,0 +1,16 @@
+"""Daily payment rollup materialized view."""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Numeric, String, Table
+
+# Views live outside Base.metadata so create_all doesn't create them as tables
+view_metadata = MetaData()
+
+payment_daily_rollup = Table(
+    "payment_daily_rollup",
+    view_metadata,
+    Column("day", DateTime),
+    Column("status", String(20)),
+    Column("product_category", String(100)),
+    Column("total", Numeric(12, 2)),
+    Column("count", Integer),
+)
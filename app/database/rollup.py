@@ -0,0 +1,131 @@
+# pylint: disable=too-few-public-methods
+"""Creation and refresh of the daily payment rollup materialized view."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.database.session import engine
+
+logger = logging.getLogger(__name__)
+
+CREATE_ROLLUP_VIEW = text(
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS payment_daily_rollup AS
+    SELECT
+        date_trunc('day', payment_date) AS day,
+        status,
+        product_category,
+        SUM(amount) AS total,
+        COUNT(*) AS count
+    FROM payments
+    GROUP BY 1, 2, 3
+    """
+)
+
+# REFRESH ... CONCURRENTLY requires a unique index on the view
+CREATE_ROLLUP_INDEX = text(
+    """
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_payment_daily_rollup
+    ON payment_daily_rollup (day, status, product_category)
+    """
+)
+
+REFRESH_ROLLUP_VIEW = text(
+    "REFRESH MATERIALIZED VIEW CONCURRENTLY payment_daily_rollup"
+)
+
+# Serializes creating and refreshing the view across workers sharing the database
+LOCK_ROLLUP = text("SELECT pg_advisory_xact_lock(hashtext('payment_daily_rollup'))")
+
+ROLLUP_EXISTS = text("SELECT to_regclass('payment_daily_rollup') IS NOT NULL")
+
+# The cutoff of the last populate is stored as the view's comment so that
+# workers other than the one that refreshed can pick it up
+ROLLUP_MARKED_CUTOFF = text(
+    "SELECT obj_description('payment_daily_rollup'::regclass, 'pg_class')"
+)
+
+
+def _mark_cutoff(cutoff: datetime):
+    """Build the statement recording ``cutoff`` on the view."""
+    # COMMENT doesn't accept bind parameters; the value is a generated date
+    return text(
+        f"COMMENT ON MATERIALIZED VIEW payment_daily_rollup "
+        f"IS '{cutoff.date().isoformat()}'"
+    )
+
+
+def _start_of_today() -> datetime:
+    """Return midnight of the current UTC day as a naive datetime."""
+    now = datetime.now(UTC)
+    return datetime(now.year, now.month, now.day)
+
+
+class RollupState:
+    """Tracks how far the rollup view is known to be complete."""
+
+    # Days strictly before this are fully summarized in the view. None until the
+    # view is created or refreshed in this process, in which case queries stay
+    # on live data.
+    cutoff: Optional[datetime] = None
+
+
+def rollup_cutoff() -> Optional[datetime]:
+    """Return the first day not covered by the rollup view."""
+    return RollupState.cutoff
+
+
+async def init_rollup():
+    """Create the rollup view and its unique index if they don't exist.
+
+    Creating the view already populates it, so in that case the cutoff is set
+    right away rather than refreshing again.
+    """
+    cutoff = _start_of_today()
+    async with engine.begin() as conn:
+        await conn.execute(LOCK_ROLLUP)
+        created = not (await conn.execute(ROLLUP_EXISTS)).scalar()
+        if created:
+            await conn.execute(CREATE_ROLLUP_VIEW)
+            await conn.execute(_mark_cutoff(cutoff))
+        await conn.execute(CREATE_ROLLUP_INDEX)
+
+    if created:
+        RollupState.cutoff = cutoff
+
+
+async def refresh_rollup():
+    """Refresh the rollup view if it is behind and advance the cutoff.
+
+    Only the first worker to get here each day refreshes the view; the others
+    wait on the lock and then reuse the cutoff it recorded.
+    """
+    today = _start_of_today()
+    async with engine.begin() as conn:
+        await conn.execute(LOCK_ROLLUP)
+        marked = (await conn.execute(ROLLUP_MARKED_CUTOFF)).scalar()
+        cutoff = datetime.fromisoformat(marked) if marked else None
+        if cutoff is None or cutoff < today:
+            await conn.execute(REFRESH_ROLLUP_VIEW)
+            await conn.execute(_mark_cutoff(today))
+            cutoff = today
+    RollupState.cutoff = cutoff
+
+
+async def refresh_rollup_periodically():
+    """Bring the rollup up to date now and then shortly after every UTC midnight."""
+    while True:
+        try:
+            await refresh_rollup()
+        except Exception:  # pylint: disable=broad-exception-caught
+            logger.exception("Failed to refresh payment_daily_rollup")
+
+        now = datetime.now(UTC)
+        next_day = datetime(now.year, now.month, now.day, tzinfo=UTC) + timedelta(
+            days=1, minutes=1
+        )
+        await asyncio.sleep((next_day - now).total_seconds())
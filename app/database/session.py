@@ -1,20 +1,46 @@
 """Database connection and session management."""
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import asyncio
+
+from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    future=True,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the shared pool and statement cache settings."""
+    return create_async_engine(
+        url,
+        echo=settings.debug,
+        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_pre_ping=True,
+        query_cache_size=settings.database_statement_cache_size,
+        connect_args={
+            "prepared_statement_cache_size": settings.database_statement_cache_size,
+            "statement_cache_size": settings.database_statement_cache_size,
+        },
+    )
+
+
+# Create async engines; read-only traffic shares the primary unless a replica is set
+engine = _create_engine(settings.database_url)
+engine_ro = (
+    _create_engine(settings.database_url_ro)
+    if settings.database_replica_host
+    else engine
 )
 
-# Create async session factory
+# Create async session factories
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -22,6 +48,13 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+AsyncSessionLocalRO = async_sessionmaker(
+    engine_ro,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
 
 # Base class for models
 Base = declarative_base()
@@ -40,7 +73,28 @@ async def get_db():
             await session.close()
 
 
+async def get_db_ro():
+    """FastAPI dependency for getting a read-only database session."""
+    async with AsyncSessionLocalRO() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+    await warm_pool(engine)
+    if engine_ro is not engine:
+        await warm_pool(engine_ro)
+
+
+async def warm_pool(target: AsyncEngine):
+    """Open ``pool_size`` connections up front so requests don't pay for handshakes."""
+    connections = await asyncio.gather(
+        *(target.connect() for _ in range(settings.database_pool_size))
+    )
+    await asyncio.gather(*(conn.close() for conn in connections))
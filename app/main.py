@@ -1,13 +1,17 @@
 """Main FastAPI application with MCP integration for payment revenue tracking."""
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi_mcp import FastApiMCP
 
 from app.api.v1.router import api_router
+from app.core.cache import init_cache
 from app.core.config import settings
-from app.database import init_db
+from app.database import init_db, init_rollup, refresh_rollup_periodically
 
 
 @asynccontextmanager
@@ -15,7 +19,12 @@ async def lifespan(_app: FastAPI):
     """Handle startup and shutdown events."""
     # Startup
     await init_db()
+    await init_rollup()
+    init_cache()
+    rollup_task = asyncio.create_task(refresh_rollup_periodically())
     yield
+    # Shutdown
+    rollup_task.cancel()
 
 
 # Create FastAPI app
@@ -25,8 +34,12 @@ app = FastAPI(
     version="1.0.0",
     debug=settings.debug,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# Compress larger JSON payloads such as by-category and by-month breakdowns
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 
 # Health check endpoint
 @app.get("/", tags=["health"])
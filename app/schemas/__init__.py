@@ -3,11 +3,13 @@
 from app.schemas.payment import (
     PaymentListResponse,
     PaymentResponse,
+    PaymentStatus,
     RevenueResponse,
 )
 
 __all__ = [
     "PaymentResponse",
     "PaymentListResponse",
+    "PaymentStatus",
     "RevenueResponse",
 ]
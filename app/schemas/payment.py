@@ -1,10 +1,13 @@
 """Pydantic schemas for payment API - Read-only responses."""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+# Payment statuses accepted by revenue queries
+PaymentStatus = Literal["completed", "pending", "failed", "refunded"]
+
 
 class PaymentResponse(BaseModel):
     """Schema for payment response."""